@@ -1,22 +1,117 @@
+import asyncio
+import contextlib
 import gradio as gr
 import os
 import tempfile
+import shutil
 import logging
 from podcastfy.client import generate_podcast
+from podcastfy.content_parser.content_extractor import ContentExtractor
 from dotenv import load_dotenv
-import json
-import urllib.request
+import orjson
+import urllib.error
+import urllib.parse
+import http.client
+import io
+import threading
 import sys
 import mimetypes
 import time
-import random
+import textwrap
+import re
+import hashlib
+import uuid
+import errno
+from concurrent.futures import ThreadPoolExecutor
 
 # Define constants for directories
 DATA_DIR = "/var/www/html/data/"
 TRANSCRIPT_DIR = "/var/www/html/data/transcripts/"
 AUDIO_DIR = "/var/www/html/data/audio/"
+# Outside DATA_DIR so cache entries are not publicly served; kept on the same
+# filesystem so published files can still be hard links to them
+CACHE_DIR = "/var/www/podcastfy-cache/"
 DATA_URL = "https://podcastify-files.ifork.eu/"
 
+# Timeout (seconds) for outgoing HTTP calls
+HTTP_TIMEOUT = 30
+
+# Block size used when streaming file bodies (http.client defaults to 8 KiB)
+HTTP_BLOCKSIZE = 1 << 16
+
+# Threads used to stage uploaded PDFs/images into the request's temp dirs (and to sweep the cache)
+UPLOAD_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="upload-stage")
+
+# Slack notifications get their own threads so they never queue behind podcast generation
+NOTIFY_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="slack-notify")
+
+# Per-file Slack uploads; long-lived threads keep their keep-alive connections warm
+SLACK_UPLOAD_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="slack-upload")
+
+# Callback POSTs are sent after the response is returned
+CALLBACK_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="callback")
+
+
+# Only http(s) URLs are passed on to podcastfy. Entries without a scheme get
+# https:// first, as podcastfy's ContentExtractor.is_url does.
+URL_RE = re.compile(r"^https?://\S+$", re.IGNORECASE)
+URL_SCHEME_RE = re.compile(r"^[a-z][a-z0-9+.-]*://", re.IGNORECASE)
+
+# Image types accepted as podcast input
+ALLOWED_IMG_EXT = frozenset({"jpg", "jpeg", "png", "gif", "webp"})
+# The same list for the upload widget, so other image types are refused before upload
+IMG_FILE_TYPES = [f".{ext}" for ext in sorted(ALLOWED_IMG_EXT)]
+
+# Static prompt blocks shared by every generated prompt. Kept as byte-identical
+# module constants so providers can cache them as a stable prompt prefix.
+LONGFORM_INSTRUCTIONS = textwrap.dedent("""
+    Additional Instructions:
+        1. Provide extensive examples and real-world applications
+        2. Include detailed analysis and multiple perspectives
+        3. Use the "yes, and" technique to build upon points
+        4. Incorporate relevant anecdotes and case studies
+        5. Balance detailed explanations with engaging dialogue
+        6. Maintain consistent voice throughout the extended discussion
+        7. Generate a long conversation - output max_output_tokens tokens
+""")
+
+COMMON_INSTRUCTIONS = textwrap.dedent("""
+    Keep the Podcast conversation in CONTEXT.
+    Continue the natural flow of conversation. Follow-up on the very previous point/question without repeating topics or points already discussed!
+    Hence, the transition should be smooth and natural. Avoid abrupt transitions.
+    Make sure the first to speak is different from the previous speaker. Look at the last tag in CONTEXT to determine the previous speaker.
+    If last tag in CONTEXT is <Person1>, then the first to speak now should be <Person2>.
+    If last tag in CONTEXT is <Person2>, then the first to speak now should be <Person1>.
+    This is a live conversation without any breaks.
+    Hence, avoid statemeents such as "we'll discuss after a short break.  Stay tuned" or "Okay, so, picking up where we left off".
+""")
+
+# Defaults used when a request leaves these fields empty
+DEFAULT_CONVERSATION_STYLE = ("engaging", "fast-paced", "enthusiastic")
+DEFAULT_DIALOGUE_STRUCTURE = ("question-answer", "discussion", "summary")
+DEFAULT_QUESTION_VOICE = "George"
+DEFAULT_ANSWER_VOICE = "Daniel"
+DEFAULT_VOICES = f"{DEFAULT_QUESTION_VOICE}, {DEFAULT_ANSWER_VOICE}"
+
+# Static parts of the conversation config; the per-request fields are merged in by process_inputs.
+# podcastfy writes straight into the public dirs so the final rename stays on one filesystem.
+TTS_CONFIG_TEMPLATE = {
+    "default_tts_model": "elevenlabs",
+    "output_directories": {
+        "transcripts": TRANSCRIPT_DIR.rstrip("/"),
+        "audio": AUDIO_DIR.rstrip("/")
+    },
+    "elevenlabs": {
+        "model": "eleven_multilingual_v2"
+    },
+    "audio_format": "mp3",
+    "temp_audio_dir": f"{AUDIO_DIR}tmp/",
+    "ending_message": ""
+}
+
+CONTENT_GENERATOR_CONFIG = {
+    "langchain_tracing_v2": False
+}
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -25,11 +120,273 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Snapshot of the settings read on every request; the environment is not
+# expected to change once the app is running.
+ENV_CACHE = {
+    key: os.getenv(key, "")
+    for key in (
+        "GEMINI_API_KEY",
+        "OPENAI_API_KEY",
+        "ELEVENLABS_API_KEY",
+        "SLACK_BOT_TOKEN",
+        "SLACK_CHANNEL_ID",
+        "WRAPPER_AUTH",
+    )
+}
+
+SLACK_BOT_TOKEN = ENV_CACHE["SLACK_BOT_TOKEN"]
+SLACK_CHANNEL_ID = ENV_CACHE["SLACK_CHANNEL_ID"]
+
+# Max characters of request params inlined in the BEGIN Slack message
+SLACK_INLINE_LIMIT = 3000
+
+# Seconds a cached transcript/podcast is reused (0 = forever). URL sources are keyed
+# by the URL alone, so this bounds how long a changed page or video is served stale.
+PODCAST_CACHE_TTL = int(os.getenv("PODCAST_CACHE_TTL", str(7 * 24 * 3600)))
+
+# Expired entries (and temp files of interrupted stores) are swept at most this often
+CACHE_SWEEP_INTERVAL = 3600
+LAST_CACHE_SWEEP = {"at": 0.0}
+
+# Max podcasts generated at once; the LLM and TTS APIs are rate limited
+PODCAST_CONCURRENCY = int(os.getenv("PODCAST_CONCURRENCY", "4"))
+GENERATION_SEMAPHORE = asyncio.Semaphore(PODCAST_CONCURRENCY)
+
+# Max process_inputs handlers Gradio runs at once. Kept above PODCAST_CONCURRENCY so
+# requests that do not generate (cache hits, mocks, PromptOnly) and requests waiting
+# on GENERATION_SEMAPHORE do not hold up one another.
+HANDLER_CONCURRENCY = int(os.getenv("HANDLER_CONCURRENCY", str(4 * PODCAST_CONCURRENCY)))
+
+# Max requests waiting in the Gradio queue before new ones are turned away
+PODCAST_QUEUE_SIZE = int(os.getenv("PODCAST_QUEUE_SIZE", "32"))
+
+# Set PODCASTFY_SHARE=0 to skip the gradio.live share tunnel (local runs, CI, Spaces)
+PODCASTFY_SHARE = os.getenv("PODCASTFY_SHARE", "1") == "1"
+
+# os.environ is process-wide: the key values currently applied there, and how many
+# generate_podcast calls are running on them
+ACTIVE_API_KEYS = {"keys": {}, "count": 0}
+API_KEYS_CONDITION = threading.Condition()
+
+# Transcript cache key -> [lock, requests holding or waiting on it]
+IN_FLIGHT = {}
+
+# Accepted spellings of the is_mock flag (lower-cased) and their canonical mode;
+# anything else means "Transcript"
+IS_MOCK_MAP = {
+    "promptonly": "PromptOnly",
+    "transcript2voice": "Transcript2Voice",
+    "false": "No",
+    "no": "No",
+    "0": "No",
+    "true": "Yes",
+    "yes": "Yes",
+    "1": "Yes",
+}
+
+# Slack tag per mode; "Yes" (and any unknown mode) is a mock run
+MOCK_FLAGS = {
+    "PromptOnly": "[PROMPT ONLY RUN]",
+    "Transcript2Voice": "[TRANSCRIPT TO VOICE RUN]",
+    "No": "[ACTUAL RUN]",
+    "Transcript": "[TRANSCRIPT ONLY]",
+}
+
 def get_api_key(key_name, ui_value):
-    return ui_value if ui_value else os.getenv(key_name)
+    return ui_value if ui_value else ENV_CACHE.get(key_name, "")
 
 def get_wrapper_auth():
-    return os.getenv("WRAPPER_AUTH")
+    return ENV_CACHE["WRAPPER_AUTH"]
+
+def link_or_copy(src_path, dest_path):
+    """Place src_path at dest_path (which must not exist) without copying its bytes when possible."""
+    try:
+        os.link(src_path, dest_path)
+    except OSError as e:
+        # Different filesystem (or no hard link support): fall back to a copy. Anything
+        # else, notably an existing dest_path, is raised: copying over it would rewrite
+        # the inode shared with every other hard link to that file.
+        if e.errno not in (errno.EXDEV, errno.EPERM):
+            raise
+        shutil.copyfile(src_path, dest_path)
+
+def store_cached(src_path, cached_path):
+    """
+    Publishes src_path as the cache entry cached_path. The entry is staged under a
+    temp name and swapped in with os.replace, so an existing entry, and the published
+    files hard-linked to it, are never written to. The request already has its
+    result, so a failure here is only logged.
+    """
+    tmp_path = f"{cached_path}.{os.urandom(8).hex()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        link_or_copy(src_path, tmp_path)
+        os.replace(tmp_path, cached_path)
+    except Exception as e:
+        logger.warning(f"Could not store cache entry {cached_path}: {e}")
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+    schedule_cache_sweep()
+
+def sweep_cache():
+    """Deletes expired cache entries and the temp files of interrupted stores."""
+    now = time.time()
+    try:
+        with os.scandir(CACHE_DIR) as entries:
+            for entry in entries:
+                with contextlib.suppress(FileNotFoundError):
+                    age = now - entry.stat().st_mtime
+                    if entry.name.endswith(".tmp"):
+                        expired = age > CACHE_SWEEP_INTERVAL
+                    else:
+                        expired = PODCAST_CACHE_TTL and age >= PODCAST_CACHE_TTL
+                    if expired:
+                        os.unlink(entry.path)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Cache sweep failed: {e}")
+
+def schedule_cache_sweep():
+    """Runs sweep_cache on UPLOAD_POOL unless it already ran within CACHE_SWEEP_INTERVAL."""
+    now = time.time()
+    if now - LAST_CACHE_SWEEP["at"] >= CACHE_SWEEP_INTERVAL:
+        LAST_CACHE_SWEEP["at"] = now
+        UPLOAD_POOL.submit(sweep_cache)
+
+def cache_fresh(cached_path):
+    """True if the cache entry exists and is younger than PODCAST_CACHE_TTL (0 = no expiry)."""
+    try:
+        age = time.time() - os.stat(cached_path).st_mtime
+    except FileNotFoundError:
+        return False
+    if not PODCAST_CACHE_TTL or age < PODCAST_CACHE_TTL:
+        return True
+    # Expired: drop it now rather than waiting for the next sweep
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(cached_path)
+    return False
+
+def link_cached(cached_path, dest_path):
+    """link_or_copy a fresh cache entry, returning False instead of raising if there is none."""
+    if not cache_fresh(cached_path):
+        return False
+    with contextlib.suppress(FileNotFoundError):
+        link_or_copy(cached_path, dest_path)
+        return True
+    return False
+
+def file_sha256(path):
+    # file_digest hashes in OpenSSL (SHA-NI where available) without per-chunk Python overhead
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+def podcast_cache_keys(text_input, urls, pdf_files, image_files, tts_model, conversation_config):
+    """
+    Hashes of everything that determines the generated podcast (uploads by content, not path).
+    The transcript key leaves out the voices, which only matter to TTS, so a run that just
+    changes voices reuses the cached transcript; the audio key adds them back.
+    """
+    tts_config = conversation_config["text_to_speech"]
+    voices = tts_config["elevenlabs"]["default_voices"]
+    transcript_config = {
+        **{k: v for k, v in conversation_config.items() if k not in ("is_mock", "is_prompt_only")},
+        "text_to_speech": {
+            **tts_config,
+            "elevenlabs": {k: v for k, v in tts_config["elevenlabs"].items() if k != "default_voices"}
+        }
+    }
+    transcript_key = hashlib.sha256(orjson.dumps({
+        "text_input": text_input,
+        "urls": urls,
+        "pdf_files": [file_sha256(path) for path in pdf_files or []],
+        "image_files": [file_sha256(path) for path in image_files or []],
+        "tts_model": tts_model,
+        "conversation_config": transcript_config
+    }, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    audio_key = hashlib.sha256(orjson.dumps({
+        "transcript": transcript_key,
+        "voices": voices
+    }, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    return transcript_key, audio_key
+
+@contextlib.asynccontextmanager
+async def single_flight(key):
+    """
+    Lets one request at a time generate for a given cache key. Identical requests
+    submitted meanwhile wait for it and then find its output in the cache. Waiters
+    do not hold a GENERATION_SEMAPHORE slot, but they do hold their Gradio handler
+    slot, which is why HANDLER_CONCURRENCY is kept above PODCAST_CONCURRENCY.
+    """
+    entry = IN_FLIGHT.get(key)
+    if entry is None:
+        entry = IN_FLIGHT[key] = [asyncio.Lock(), 0]
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if not entry[1]:
+            del IN_FLIGHT[key]
+
+def get_cache_paths(transcript_key, audio_key):
+    return f"{CACHE_DIR}transcript_{transcript_key}.txt", f"{CACHE_DIR}podcast_{audio_key}.mp3"
+
+@contextlib.contextmanager
+def scoped_api_keys(api_keys):
+    """
+    Applies per-request API keys to os.environ (where podcastfy reads them) for
+    the duration of the block. os.environ is shared by every running call, so a
+    request whose keys differ from the ones in use waits until those calls have
+    drained; requests with matching keys (the common case of server keys) run
+    together. The server defaults are put back when the last of them finishes,
+    so a key entered in the UI never outlives its requests.
+    """
+    def compatible():
+        active = ACTIVE_API_KEYS["keys"]
+        return all(active.get(key, value) == value for key, value in api_keys.items())
+
+    with API_KEYS_CONDITION:
+        API_KEYS_CONDITION.wait_for(compatible)
+        for key, value in api_keys.items():
+            if key not in ACTIVE_API_KEYS["keys"]:
+                ACTIVE_API_KEYS["keys"][key] = value
+                if value:
+                    os.environ[key] = value
+                else:
+                    os.environ.pop(key, None)
+        ACTIVE_API_KEYS["count"] += 1
+    try:
+        yield
+    finally:
+        with API_KEYS_CONDITION:
+            ACTIVE_API_KEYS["count"] -= 1
+            if not ACTIVE_API_KEYS["count"]:
+                for key in ACTIVE_API_KEYS["keys"]:
+                    if ENV_CACHE[key]:
+                        os.environ[key] = ENV_CACHE[key]
+                    else:
+                        os.environ.pop(key, None)
+                ACTIVE_API_KEYS["keys"] = {}
+                API_KEYS_CONDITION.notify_all()
+
+def generate_podcast_with_keys(api_keys, kwargs):
+    with scoped_api_keys(api_keys):
+        return generate_podcast(**kwargs)
+
+async def run_generate_podcast(api_keys, **kwargs):
+    """Runs generate_podcast in a worker thread, at most PODCAST_CONCURRENCY at a time."""
+    async with GENERATION_SEMAPHORE:
+        return await asyncio.to_thread(generate_podcast_with_keys, api_keys, kwargs)
+
+def extract_input_text(urls, text_input):
+    """Builds the LLM input text from URLs/PDFs and free text the way podcastfy does, without any LLM call."""
+    content_extractor = ContentExtractor()
+    contents = [content_extractor.extract_content(url) for url in urls]
+    if text_input:
+        contents.append(text_input)
+    return "\n\n".join(contents)
 
 def generatePrompt(
     input_params,
@@ -38,37 +395,14 @@ def generatePrompt(
     input_text,
     prompt_params
     ):
-    # Constants
-    LONGFORM_INSTRUCTIONS = """
-                                Additional Instructions:
-                                    1. Provide extensive examples and real-world applications
-                                    2. Include detailed analysis and multiple perspectives
-                                    3. Use the "yes, and" technique to build upon points
-                                    4. Incorporate relevant anecdotes and case studies
-                                    5. Balance detailed explanations with engaging dialogue
-                                    6. Maintain consistent voice throughout the extended discussion
-                                    7. Generate a long conversation - output max_output_tokens tokens
-                            """
-
-    COMMON_INSTRUCTIONS = """
-                                Keep the Podcast conversation in CONTEXT.
-                                Continue the natural flow of conversation. Follow-up on the very previous point/question without repeating topics or points already discussed!
-                                Hence, the transition should be smooth and natural. Avoid abrupt transitions.
-                                Make sure the first to speak is different from the previous speaker. Look at the last tag in CONTEXT to determine the previous speaker.
-                                If last tag in CONTEXT is <Person1>, then the first to speak now should be <Person2>.
-                                If last tag in CONTEXT is <Person2>, then the first to speak now should be <Person1>.
-                                This is a live conversation without any breaks.
-                                Hence, avoid statemeents such as "we'll discuss after a short break.  Stay tuned" or "Okay, so, picking up where we left off".
-                            """
-
     # Enhance the prompt_params
     prompt_params = {}
 
     prompt_params["word_count"] = input_params.get("word_count", 2000)
-    prompt_params["conversation_style"] = input_params.get("conversation_style", "engaging,fast-paced,enthusiastic".split(','))
+    prompt_params["conversation_style"] = input_params.get("conversation_style", DEFAULT_CONVERSATION_STYLE)
     prompt_params["roles_person1"] = input_params.get("roles_person1", "host")
     prompt_params["roles_person2"] = input_params.get("roles_person2", "expert guest")
-    prompt_params["dialogue_structure"] = input_params.get("dialogue_structure", "question-answer,discussion,summary".split(','))
+    prompt_params["dialogue_structure"] = input_params.get("dialogue_structure", DEFAULT_DIALOGUE_STRUCTURE)
 
     podcast_name= podcast_name if podcast_name else "Podcastfy"
     podcast_tagline = podcast_tagline if podcast_tagline else ""
@@ -83,7 +417,7 @@ def generatePrompt(
             """
     return prompt_params
 
-def process_inputs(
+async def process_inputs(
     text_input,
     urls_input,
     pdf_files,
@@ -107,55 +441,42 @@ def process_inputs(
     callback_url,
     language
 ):
+    temp_dir = None
+    in_flight = contextlib.AsyncExitStack()
     try:
         # Unique identfier time based
         logger.info("Starting podcast generation process")
-        logger.info("Param " + json.dumps({
-            "text_input": text_input,
-            "urls_input": urls_input,
-            "pdf_files": pdf_files,
-            "image_files": image_files,
-            "gemini_key": gemini_key,
-            "openai_key": openai_key,
-            "elevenlabs_key": elevenlabs_key,
-            "word_count": word_count,
-            "conversation_style": conversation_style,
-            "roles_person1": roles_person1,
-            "roles_person2": roles_person2,
-            "dialogue_structure": dialogue_structure,
-            "podcast_name": podcast_name,
-            "podcast_tagline": podcast_tagline,
-            "tts_model": tts_model,
-            "creativity_level": creativity_level,
-            "user_instructions": user_instructions,
-            "voices": voices,
-            "is_mock": is_mock,
-            "request_id": request_id,
-            "callback_url": callback_url,
-            "language": language
-        }, indent=4) )
-
-        # API key handling
-        logger.debug("Setting API keys")
-        os.environ["GEMINI_API_KEY"] = get_api_key("GEMINI_API_KEY", gemini_key)
-
-        if tts_model == "openai":
-            logger.debug("Setting OpenAI API key")
-            if not openai_key and not os.getenv("OPENAI_API_KEY"):
-                raise ValueError("OpenAI API key is required when using OpenAI TTS model")
-            os.environ["OPENAI_API_KEY"] = get_api_key("OPENAI_API_KEY", openai_key)
-
-        if tts_model == "elevenlabs":
-            logger.debug("Setting ElevenLabs API key")
-            if not elevenlabs_key and not os.getenv("ELEVENLABS_API_KEY"):
-                raise ValueError("ElevenLabs API key is required when using ElevenLabs TTS model")
-            os.environ["ELEVENLABS_API_KEY"] = get_api_key("ELEVENLABS_API_KEY", elevenlabs_key)
-
-        SLACK_BOT_TOKEN = get_api_key("SLACK_BOT_TOKEN", "")
-        SLACK_CHANNEL_ID = get_api_key("SLACK_CHANNEL_ID", "")
+        if logger.isEnabledFor(logging.DEBUG):
+            # Uploads are summarized and API keys masked rather than dumped verbatim
+            logger.debug("Param %s", orjson.dumps({
+                "text_input": text_input,
+                "urls_input": urls_input,
+                "pdf_files": f"{len(pdf_files or [])} files",
+                "image_files": f"{len(image_files or [])} files",
+                "gemini_key": "<redacted>" if gemini_key else "",
+                "openai_key": "<redacted>" if openai_key else "",
+                "elevenlabs_key": "<redacted>" if elevenlabs_key else "",
+                "word_count": word_count,
+                "conversation_style": conversation_style,
+                "roles_person1": roles_person1,
+                "roles_person2": roles_person2,
+                "dialogue_structure": dialogue_structure,
+                "podcast_name": podcast_name,
+                "podcast_tagline": podcast_tagline,
+                "tts_model": tts_model,
+                "creativity_level": creativity_level,
+                "user_instructions": user_instructions,
+                "voices": voices,
+                "is_mock": is_mock,
+                "request_id": request_id,
+                "callback_url": callback_url,
+                "language": language
+            }, option=orjson.OPT_INDENT_2).decode())
 
         requestId = request_id
-        file_group = str(int(time.time())) + "_" + str(random.randint(1000, 9999))
+        # Handlers run concurrently, so the suffix must not collide: the output files
+        # are named after it and shutil.move would overwrite another request's files
+        file_group = f"{int(time.time())}_{uuid.uuid4().hex}"
         if not requestId:
             requestId = file_group
 
@@ -163,21 +484,28 @@ def process_inputs(
         if not is_mock:
             is_mock = "No"
 
+        is_mock = IS_MOCK_MAP.get(str(is_mock).lower(), "Transcript")
+        mock_flag = MOCK_FLAGS.get(is_mock, "[MOCK RUN]")
 
-        if isinstance(is_mock, str) and (is_mock.lower() == "promptonly"):
-            is_mock = "PromptOnly"
-        elif isinstance(is_mock, str) and (is_mock.lower() == "transcript2voice"):
-            is_mock = "Transcript2Voice"
-        elif isinstance(is_mock, str) and (is_mock.lower() == "false" or is_mock.lower() == "no" or is_mock.lower() == "0"):
-            is_mock = "No"
-        elif isinstance(is_mock, str) and (is_mock.lower() == "true" or is_mock.lower() == "yes" or is_mock.lower() == "1"):
-            is_mock = "Yes"
-        else:
-            is_mock = "Transcript"
+        # API key handling: the keys are only applied around each generate_podcast call
+        logger.debug("Setting API keys")
+        api_keys = {"GEMINI_API_KEY": get_api_key("GEMINI_API_KEY", gemini_key)}
+
+        if tts_model == "openai":
+            logger.debug("Setting OpenAI API key")
+            if not openai_key and not ENV_CACHE["OPENAI_API_KEY"]:
+                raise ValueError("OpenAI API key is required when using OpenAI TTS model")
+            api_keys["OPENAI_API_KEY"] = get_api_key("OPENAI_API_KEY", openai_key)
+
+        if tts_model == "elevenlabs":
+            logger.debug("Setting ElevenLabs API key")
+            if not elevenlabs_key and not ENV_CACHE["ELEVENLABS_API_KEY"]:
+                raise ValueError("ElevenLabs API key is required when using ElevenLabs TTS model")
+            api_keys["ELEVENLABS_API_KEY"] = get_api_key("ELEVENLABS_API_KEY", elevenlabs_key)
 
         # Parse voices
         if not voices:
-            voices = "George, Daniel"
+            voices = DEFAULT_VOICES
 
         voices = voices.split(',')
         logger.debug(f"Voices: {voices}")
@@ -188,62 +516,85 @@ def process_inputs(
             question_voice = voices[0].strip()
             answer_voice = voices[0].strip()
         else:
-            question_voice = "George"
-            answer_voice = "Daniel"
+            question_voice = DEFAULT_QUESTION_VOICE
+            answer_voice = DEFAULT_ANSWER_VOICE
 
         question_voice = question_voice.replace(" ", "");
         answer_voice = answer_voice.replace(" ", "");
 
         # Process URLs
-        urls = [url.strip() for url in urls_input.split('\n') if url.strip()]
+        # De-duplicated in input order; invalid entries fail the request before any LLM work
+        urls = []
+        invalid_urls = []
+        for url in (url.strip() for url in urls_input.split('\n')):
+            if not url:
+                continue
+            if not URL_SCHEME_RE.match(url):
+                url = f"https://{url}"
+            if URL_RE.match(url):
+                urls.append(url)
+            else:
+                invalid_urls.append(url)
+        if invalid_urls:
+            raise ValueError(f"Invalid URL(s), only http(s) is supported: {', '.join(invalid_urls)}")
+        urls = list(dict.fromkeys(urls))
         logger.debug(f"Processed URLs: {urls}")
+        source_urls = list(urls)
 
-        temp_files = []
-        temp_dirs = []
+        # Uploads are collected as (source, destination) pairs and staged together below
+        staged_sources = []
+        staged_paths = []
+
+        # The "Yes" mock returns canned files and never reads the uploads, so skip staging them
+        stage_uploads = is_mock != "Yes"
+
+        # All staged uploads share one temp dir, removed in one go when the request ends
+        if stage_uploads and (pdf_files or image_files):
+            temp_dir = tempfile.TemporaryDirectory(prefix=f"pf_{file_group}_", ignore_cleanup_errors=True)
 
         # Handle PDF files
-        if pdf_files is not None and len(pdf_files) > 0:
+        if stage_uploads and pdf_files is not None and len(pdf_files) > 0:
             logger.info(f"Processing {len(pdf_files)} PDF files")
-            pdf_temp_dir = tempfile.mkdtemp()
-            temp_dirs.append(pdf_temp_dir)
-
-            for i, pdf_file in enumerate(pdf_files):
-                pdf_path = os.path.join(pdf_temp_dir, f"input_pdf_{i}.pdf")
-                temp_files.append(pdf_path)
+            pdf_temp_dir = os.path.join(temp_dir.name, "pdfs")
+            os.mkdir(pdf_temp_dir)
 
-                with open(pdf_path, 'wb') as f:
-                    f.write(pdf_file)
-                urls.append(pdf_path)
-                logger.debug(f"Saved PDF {i} to {pdf_path}")
+            pdf_paths = [os.path.join(pdf_temp_dir, f"input_pdf_{i}.pdf") for i in range(len(pdf_files))]
+            staged_sources.extend(pdf_files)
+            staged_paths.extend(pdf_paths)
+            urls.extend(pdf_paths)
 
         # Handle image files
         image_paths = []
-        if image_files is not None and len(image_files) > 0:
+        if stage_uploads and image_files is not None and len(image_files) > 0:
             logger.info(f"Processing {len(image_files)} image files")
-            img_temp_dir = tempfile.mkdtemp()
-            temp_dirs.append(img_temp_dir)
+            img_temp_dir = os.path.join(temp_dir.name, "images")
+            os.mkdir(img_temp_dir)
 
             for i, img_file in enumerate(image_files):
-                # Get file extension from the original name in the file tuple
-                original_name = img_file.orig_name if hasattr(img_file, 'orig_name') else f"image_{i}.jpg"
-                extension = original_name.split('.')[-1]
+                # Gradio keeps the original file name in the uploaded path
+                original_name = os.path.basename(img_file)
+                extension = os.path.splitext(original_name)[1].lstrip('.').lower() or "jpg"
+                if extension not in ALLOWED_IMG_EXT:
+                    raise ValueError(f"Unsupported image type: {original_name}")
 
                 logger.debug(f"Processing image file {i}: {original_name}")
                 img_path = os.path.join(img_temp_dir, f"input_image_{i}.{extension}")
-                temp_files.append(img_path)
-
-                try:
-                    # Write the bytes directly to the file
-                    with open(img_path, 'wb') as f:
-                        if isinstance(img_file, (tuple, list)):
-                            f.write(img_file[1])  # Write the bytes content
-                        else:
-                            f.write(img_file)     # Write the bytes directly
-                    image_paths.append(img_path)
-                    logger.debug(f"Saved image {i} to {img_path}")
-                except Exception as e:
-                    logger.error(f"Error saving image {i}: {str(e)}")
-                    raise
+                staged_sources.append(img_file)
+                image_paths.append(img_path)
+            staged_paths.extend(image_paths)
+
+        # The files are independent, so stage them all concurrently on the shared pool
+        if staged_paths:
+            loop = asyncio.get_running_loop()
+            try:
+                await asyncio.gather(*(
+                    loop.run_in_executor(UPLOAD_POOL, link_or_copy, src_path, dest_path)
+                    for src_path, dest_path in zip(staged_sources, staged_paths)
+                ))
+            except Exception as e:
+                logger.error(f"Error saving uploaded files: {str(e)}")
+                raise
+            logger.debug(f"Saved uploaded files to {staged_paths}")
 
         # Prepare conversation config
         logger.debug("Preparing conversation config")
@@ -259,25 +610,16 @@ def process_inputs(
             "creativity": creativity_level,
             "user_instructions": user_instructions,
             "text_to_speech": {
-                "default_tts_model": "elevenlabs",
-                "output_directories": {
-                    "transcripts": "data/transcripts",
-                    "audio": "data/audio"
-                },
+                **TTS_CONFIG_TEMPLATE,
                 "elevenlabs": {
+                    **TTS_CONFIG_TEMPLATE["elevenlabs"],
                     "default_voices": {
                         "question": question_voice,
                         "answer": answer_voice
-                    },
-                    "model": "eleven_multilingual_v2"
-                },
-                "audio_format": "mp3",
-                "temp_audio_dir": "data/audio/tmp/",
-                "ending_message": ""
-            },
-            "content_generator": {
-                "langchain_tracing_v2": False
+                    }
+                }
             },
+            "content_generator": CONTENT_GENERATOR_CONFIG,
             "output_language": language,
             "is_mock": is_mock,
             "is_prompt_only": is_mock == "PromptOnly"
@@ -289,30 +631,36 @@ def process_inputs(
         logger.debug(f"Image paths: {image_paths}")
         logger.debug(f"Text input present: {'Yes' if text_input else 'No'}")
 
-
-        mock_flag = "[MOCK RUN]"
-        if (is_mock == "PromptOnly"):
-            mock_flag = "[PROMPT ONLY RUN]"
-        elif (is_mock == "Transcript2Voice"):
-            mock_flag = "[TRANSCRIPT TO VOICE RUN]"
-        elif (is_mock == "No"):
-            mock_flag = "[ACTUAL RUN]"
-        elif (is_mock == "Transcript"):
-            mock_flag = "[TRANSCRIPT ONLY]"
-
-        send_files_to_slack(requestId, file_group, f"[{requestId}][{mock_flag}][BEGIN]", json.dumps({
+        # The BEGIN notification is informational only, so it is sent in the
+        # background while the podcast is being generated. There are no result
+        # files yet, so a single chat.postMessage with the params inline is enough.
+        begin_params = orjson.dumps({
             "is_mock": is_mock,
             "urls": urls,
             "text_input": text_input,
             "image_paths": image_paths,
             "tts_model": tts_model,
             "conversation_config": conversation_config
-        }, indent=4) + "\n```\n", None, None, SLACK_BOT_TOKEN, SLACK_CHANNEL_ID)
+        }, option=orjson.OPT_INDENT_2).decode()
+        if len(begin_params) > SLACK_INLINE_LIMIT:
+            begin_params = begin_params[:SLACK_INLINE_LIMIT] + "\n... (truncated)"
+        begin_future = notify_in_background(send_text_to_slack, f"[{requestId}][{mock_flag}][BEGIN]\n```\n{begin_params}\n```", SLACK_BOT_TOKEN, SLACK_CHANNEL_ID)
 
         result = {}
         transcript_file = None
         audio_file = None
         prompt_file = None
+
+        # Generated runs are cached by input content: a repeated request skips LLM + TTS,
+        # and one that only changes voices skips the LLM
+        cache_keys = None
+        if is_mock in ("No", "Transcript"):
+            cache_keys = await asyncio.to_thread(podcast_cache_keys, text_input, source_urls, pdf_files, image_files, tts_model, conversation_config)
+            # A duplicate of a request still running waits here instead of regenerating;
+            # it keeps its handler slot meanwhile, bounded by HANDLER_CONCURRENCY
+            await in_flight.enter_async_context(single_flight(cache_keys[0]))
+        cached_transcript_file, cached_audio_file = get_cache_paths(*cache_keys) if cache_keys else (None, None)
+
         if (is_mock == "Transcript2Voice") :
             # Q: How may I get epoch timestamp in python?
             # A: You can use time.time() function to get the current epoch timestamp in python.
@@ -320,7 +668,8 @@ def process_inputs(
             with open(transcript_file, "w") as f:
                 f.write(user_instructions)
 
-            _result = generate_podcast(
+            _result = await run_generate_podcast(
+                api_keys=api_keys,
                 urls=urls if urls else None,
                 text=text_input if text_input else None,
                 image_paths=image_paths if image_paths else None,
@@ -345,32 +694,49 @@ def process_inputs(
                 "audio_file": audio_file,
                 "transcript_file": transcript_file
             }
+        elif is_mock == "No" and cache_fresh(cached_transcript_file) and cache_fresh(cached_audio_file):
+            logger.info(f"Cache hit for {cache_keys[1]}")
+            transcript_file = f"{TRANSCRIPT_DIR}transcript_{file_group}.txt"
+            audio_file = f"{AUDIO_DIR}podcast_{file_group}.mp3"
+            link_or_copy(cached_transcript_file, transcript_file)
+            link_or_copy(cached_audio_file, audio_file)
+            result = {
+                "audio_file": audio_file,
+                "transcript_file": transcript_file
+            }
         elif is_mock == "Transcript" or is_mock == "No":
             transcript_file = f"{TRANSCRIPT_DIR}transcript_{file_group}.txt"
-            _result = generate_podcast(
-                urls=urls if urls else None,
-                text=text_input if text_input else None,
-                image_paths=image_paths if image_paths else None,
-                tts_model=tts_model,
-                conversation_config=conversation_config,
-                transcript_only=True,
-                longform=word_count > 5000
-            )
-            if isinstance(_result, str):
-                transcript_file = _result
+            if link_cached(cached_transcript_file, transcript_file):
+                logger.info(f"Transcript cache hit for {cache_keys[0]}")
             else:
-                result = _result
-                transcript_file = _result["transcript_file"]
-            transcript_file = os.path.abspath(transcript_file)
-            transcript_file_new = f"{TRANSCRIPT_DIR}transcript_{file_group}.txt"
-            os.rename(transcript_file, transcript_file_new)
-            transcript_file = transcript_file_new
+                _result = await run_generate_podcast(
+                    api_keys=api_keys,
+                    urls=urls if urls else None,
+                    text=text_input if text_input else None,
+                    image_paths=image_paths if image_paths else None,
+                    tts_model=tts_model,
+                    conversation_config=conversation_config,
+                    transcript_only=True,
+                    longform=word_count > 5000
+                )
+                if isinstance(_result, str):
+                    transcript_file = _result
+                else:
+                    result = _result
+                    transcript_file = _result["transcript_file"]
+                transcript_file = os.path.abspath(transcript_file)
+                transcript_file_new = f"{TRANSCRIPT_DIR}transcript_{file_group}.txt"
+                shutil.move(transcript_file, transcript_file_new)
+                transcript_file = transcript_file_new
+
+                store_cached(transcript_file, cached_transcript_file)
             result["transcript_file"] = transcript_file
 
             if is_mock == "Transcript":
                 audio_file = None
             else:
-                _result = generate_podcast(
+                _result = await run_generate_podcast(
+                    api_keys=api_keys,
                     urls=urls if urls else None,
                     text=text_input if text_input else None,
                     image_paths=image_paths if image_paths else None,
@@ -386,50 +752,31 @@ def process_inputs(
                 audio_file = os.path.abspath(audio_file)
                 # rename the audio_file to include the request id and move the file to the public directory
                 audio_file_new = f"{AUDIO_DIR}podcast_{file_group}.mp3"
-                os.rename(audio_file, audio_file_new)
+                shutil.move(audio_file, audio_file_new)
                 audio_file = audio_file_new
                 result["audio_file"] = audio_file
-        elif is_mock == "PromptOnly" or is_mock == "No":
-            _result = generate_podcast(
-                urls=urls if urls else None,
-                text=text_input if text_input else None,
-                image_paths=image_paths if image_paths else None,
-                tts_model=tts_model,
-                conversation_config=conversation_config,
-                transcript_only=True,
-                longform=word_count > 5000
-            )
-            if isinstance(_result, str):
-                prompt_content = _result
-            else:
-                prompt_content = _result["prompt"]
 
-            prompt_details = json.loads(prompt_content)
-            text_input = prompt_details["input_text"];
-            prompt_content = generatePrompt(conversation_config, podcast_name, podcast_tagline, text_input, prompt_details)
+                store_cached(audio_file, cached_audio_file)
+        elif is_mock == "PromptOnly":
+            # Only the prompt is needed, so extract the sources directly instead of
+            # running the transcript pipeline just to read its input text back
+            # The prompt file is text-only; images are only consumed by the LLM call itself
+            if image_paths:
+                logger.warning(f"PromptOnly ignores the {len(image_paths)} uploaded image(s)")
+            text_input = await asyncio.to_thread(extract_input_text, urls, text_input)
+            prompt_content = generatePrompt(conversation_config, podcast_name, podcast_tagline, text_input, {})
 
             transcript_file = None
             audio_file = None
             prompt_file = f"{TRANSCRIPT_DIR}prompt_{file_group}.json"
-            with open(prompt_file, "w") as f:
-                f.write(json.dumps(prompt_content))
+            with open(prompt_file, "wb") as f:
+                f.write(orjson.dumps(prompt_content))
             logger.info(f"Prompt file created: {prompt_file}")
             prompt_file = os.path.abspath(prompt_file)
 
 
         logger.info(f"Podcast generation completed => {audio_file}")
 
-        # Cleanup
-        logger.debug("Cleaning up temporary files")
-        for file_path in temp_files:
-            if os.path.exists(file_path):
-                os.unlink(file_path)
-                logger.debug(f"Removed temp file: {file_path}")
-        for dir_path in temp_dirs:
-            if os.path.exists(dir_path):
-                os.rmdir(dir_path)
-                logger.debug(f"Removed temp directory: {dir_path}")
-
         http_audio_file = ""
         http_transcript_file = ""
 
@@ -442,7 +789,9 @@ def process_inputs(
         if prompt_file:
             http_transcript_file = prompt_file.replace(DATA_DIR, DATA_URL)
 
-        send_files_to_slack(requestId, file_group, f"{requestId}\t{mock_flag}[COMPLETED]", json.dumps({
+        # COMPLETED does not hold up the response; it is queued behind BEGIN so
+        # the channel order is kept.
+        completed_args = (send_files_to_slack, requestId, file_group, f"{requestId}\t{mock_flag}[COMPLETED]", orjson.dumps({
             "is_mock": is_mock,
             "urls": urls,
             "text_input": text_input,
@@ -452,7 +801,8 @@ def process_inputs(
             "result": result,
             "http_audio_file": http_audio_file,
             "http_transcript_file": http_transcript_file
-        }, indent=4) + "\n```\n", audio_file, transcript_file, SLACK_BOT_TOKEN, SLACK_CHANNEL_ID)
+        }, option=orjson.OPT_INDENT_2).decode() + "\n```\n", audio_file, transcript_file, SLACK_BOT_TOKEN, SLACK_CHANNEL_ID)
+        begin_future.add_done_callback(lambda _: notify_in_background(*completed_args))
 
         if callback_url:
             # HTTP POST to callback URL with the transcript and audio file using public URLs
@@ -472,8 +822,10 @@ def process_inputs(
                     "input_params": {
                         "text_input": text_input,
                         "urls_input": urls_input,
-                        "pdf_files": pdf_files,
-                        "image_files": image_files,
+                        # Original upload names; the staged copies are deleted before this is sent
+                        "urls": source_urls,
+                        "pdf_files": [os.path.basename(path) for path in pdf_files or []],
+                        "image_files": [os.path.basename(path) for path in image_files or []],
                         "gemini_key": gemini_key,
                         "openai_key": openai_key,
                         "elevenlabs_key": elevenlabs_key,
@@ -496,50 +848,111 @@ def process_inputs(
                 }
             }
 
-            # Convert the payload to JSON bytes
-            data = json.dumps(payload).encode("utf-8")
-
-            # Create a request with the required headers:
-            # - Content-Type set to application/json
-            request = urllib.request.Request(
-                callback_url,
-                data=data,
-                headers={
-                    "Content-Type": "application/json; charset=utf-8",
-                    "Authorization": get_wrapper_auth()
-                },
-                method="POST"
-            )
-
-            # Send the request
-            try:
-                with urllib.request.urlopen(request) as response:
-                    response_data = response.read().decode("utf-8")
-                    parsed = json.loads(response_data)
-
-                    if parsed.get("ok"):
-                        logger.info("Callback sent successfully.")
-                    else:
-                        logger.error(f"Error sending callback: {parsed}")
-            except Exception as e:
-                import traceback
-                trace = traceback.format_exc()
-                logger.error(f"[SEND CALLBACK] Exception occurred: {e}\t{trace}")
+            # The receiver does not answer the UI, so the POST does not hold up the response
+            CALLBACK_POOL.submit(send_callback, callback_url, orjson.dumps(payload))
 
         return audio_file
 
     except Exception as e:
         logger.error(f"Error in process_inputs: {str(e)}", exc_info=True)
-        send_text_to_slack(f"[{requestId}][{mock_flag}][ERROR]\t{str(e)}", SLACK_BOT_TOKEN, SLACK_CHANNEL_ID)
-        # Cleanup on error
-        for file_path in temp_files:
-            if os.path.exists(file_path):
-                os.unlink(file_path)
-        for dir_path in temp_dirs:
-            if os.path.exists(dir_path):
-                os.rmdir(dir_path)
+        notify_in_background(send_text_to_slack, f"[{requestId}][{mock_flag}][ERROR]\t{str(e)}", SLACK_BOT_TOKEN, SLACK_CHANNEL_ID)
         return str(e)
 
+    finally:
+        await in_flight.aclose()
+        if temp_dir is not None:
+            logger.debug("Cleaning up temporary files")
+            temp_dir.cleanup()
+
+# Keep-alive connections, one set per thread since http.client connections are not thread-safe
+_http_local = threading.local()
+
+def _new_connection(scheme, netloc):
+    conn_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+    return conn_class(netloc, timeout=HTTP_TIMEOUT, blocksize=HTTP_BLOCKSIZE)
+
+def _get_connection(scheme, netloc):
+    connections = getattr(_http_local, "connections", None)
+    if connections is None:
+        connections = _http_local.connections = {}
+    conn = connections.get((scheme, netloc))
+    if conn is None:
+        conn = connections[(scheme, netloc)] = _new_connection(scheme, netloc)
+    return conn
+
+def http_post(url, data, headers=None, keep_alive=True):
+    """
+    POSTs data over a reused keep-alive connection and returns (status, body).
+    With keep_alive=False a one-off connection is used and closed afterwards,
+    for hosts that are not worth keeping a socket open to in every thread.
+    Raises urllib.error.HTTPError for 4xx/5xx responses, like urlopen does.
+    Unlike urlopen it does not follow redirects (a 3xx is returned as is) and
+    does not go through HTTP(S)_PROXY; outgoing calls connect directly.
+    """
+    parts = urllib.parse.urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+
+    for attempt in range(2):
+        conn = _get_connection(parts.scheme, parts.netloc) if keep_alive else _new_connection(parts.scheme, parts.netloc)
+        reused = conn.sock is not None
+        try:
+            conn.request("POST", path, body=data, headers=headers or {})
+            response = conn.getresponse()
+            body = response.read()
+            break
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            # The server dropped an idle keep-alive connection: reconnect and retry once.
+            # On a fresh connection the POST may have been received, so it is not resent.
+            conn.close()
+            if attempt or not reused:
+                raise
+            if hasattr(data, "seek"):
+                data.seek(0)
+        except Exception:
+            conn.close()
+            raise
+
+    if not keep_alive:
+        conn.close()
+    if response.status >= 400:
+        raise urllib.error.HTTPError(url, response.status, response.reason, response.headers, io.BytesIO(body))
+    return response.status, body
+
+def notify_in_background(fn, *args):
+    """Runs a Slack notification on NOTIFY_POOL without waiting for it."""
+    future = NOTIFY_POOL.submit(fn, *args)
+    future.add_done_callback(_log_notify_failure)
+    return future
+
+def _log_notify_failure(future):
+    exc = future.exception()
+    if exc is not None:
+        logger.error(f"[NOTIFY] Background notification failed: {exc}", exc_info=exc)
+
+def send_callback(callback_url, data):
+    """POSTs the JSON-encoded result payload to the caller's callback URL."""
+    try:
+        # callback_url is caller-supplied, so its connection is not kept in the per-thread cache
+        status, response_data = http_post(callback_url, data, headers={
+            "Content-Type": "application/json; charset=utf-8",
+            "Authorization": get_wrapper_auth()
+        }, keep_alive=False)
+        if status >= 300:
+            logger.error(f"Error sending callback: {callback_url} answered {status} (redirects are not followed)")
+            return
+        parsed = orjson.loads(response_data)
+
+        if parsed.get("ok"):
+            logger.info("Callback sent successfully.")
+        else:
+            logger.error(f"Error sending callback: {parsed}")
+    except Exception as e:
+        import traceback
+        trace = traceback.format_exc()
+        logger.error(f"[SEND CALLBACK] Exception occurred: {e}\t{trace}")
+
 def send_text_to_slack(text, SLACK_BOT_TOKEN, SLACK_CHANNEL_ID):
     """
     Sends the given text as a message to the specified Slack channel using
@@ -555,102 +968,98 @@ def send_text_to_slack(text, SLACK_BOT_TOKEN, SLACK_CHANNEL_ID):
     }
 
     # Convert the payload to JSON bytes
-    data = json.dumps(payload).encode("utf-8")
+    data = orjson.dumps(payload)
 
-    # Create a request with the required headers:
+    # Send the request with the required headers:
     # - Authorization with the Bearer token
     # - Content-Type set to application/json
-    request = urllib.request.Request(
-        url,
-        data=data,
-        headers={
+    try:
+        _, response_data = http_post(url, data, headers={
             "Authorization": f"Bearer {SLACK_BOT_TOKEN}",
             "Content-Type": "application/json; charset=utf-8"
-        },
-        method="POST"
-    )
+        })
+        parsed = orjson.loads(response_data)
 
-    # Send the request
-    try:
-        with urllib.request.urlopen(request) as response:
-            response_data = response.read().decode("utf-8")
-            parsed = json.loads(response_data)
-
-            if parsed.get("ok"):
-                print("Message sent successfully.")
-            else:
-                print(f"Error sending message: {parsed}")
+        if parsed.get("ok"):
+            print("Message sent successfully.")
+        else:
+            print(f"Error sending message: {parsed}")
     except Exception as e:
         import traceback
         trace = traceback.format_exc()
         print(f"[SEND TO SLACK] Exception occurred: {e}\t{trace}")
 
-# Send to Slack the Result files (Audio and Transcript)
-def send_files_to_slack(uuid, file_group, initial_comment, input_params, audio_filepath, transcript_filepath, SLACK_BOT_TOKEN, SLACK_CHANNEL_ID):
-    """Uploads audio and transcript to Slack in a single message."""
-    #  Store input_params in a tmp file that should be also sent
-    input_params_file_path = os.path.abspath(f"data/input_params_{file_group}.json")
-    with open(input_params_file_path, "w") as input_params_file:
-        input_params_file.write(input_params)
-
-    try:
-        # 1. Get upload URLs for both files
-        upload_urls = {}
-        file_ids = {}
-        files = {}
-
-        files["input"] = input_params_file_path
+def upload_file_to_slack(filetype, filepath, SLACK_BOT_TOKEN, content=None):
+    """
+    Runs steps 1-2 of Slack's external upload for one file and returns its
+    file id, or None if the file does not exist. When content is given it is
+    uploaded from memory and filepath only names the file.
+    """
+    print(f"Check file: {filepath}\t{filetype}")
+    if content is not None:
+        file_size = len(content)
+    else:
+        try:
+            file_size = os.path.getsize(filepath)
+        except FileNotFoundError:
+            return None
 
-        if audio_filepath is not None:
-            files["audio"] = audio_filepath
+    # 1. Get the upload URL
+    url_external_url = "https://slack.com/api/files.getUploadURLExternal"
+    url_external_data = urllib.parse.urlencode({
+        "filename": os.path.basename(filepath),
+        "length": file_size
+    }).encode("utf-8")
 
-        if transcript_filepath is not None:
-            files["transcript"] = transcript_filepath
+    _, url_external_response = http_post(url_external_url, url_external_data, headers={
+        "Authorization": f"Bearer {SLACK_BOT_TOKEN}",
+        "Content-Type": "application/x-www-form-urlencoded"
+    })
+    url_external_data = orjson.loads(url_external_response)
 
-        for filetype in files:
-            filepath = files[filetype]
-            print(f"Check file: {filepath}\t{filetype}")
-            if not os.path.exists(filepath):
-                continue
+    if not url_external_data.get("ok"):
+        raise Exception(f"Error getting upload URL for {filetype}: {url_external_data}")
 
-            url_external_url = "https://slack.com/api/files.getUploadURLExternal"
-            url_external_data = urllib.parse.urlencode({
-                "filename": os.path.basename(filepath),
-                "length": os.path.getsize(filepath)
-            }).encode("utf-8")
+    upload_url = url_external_data["upload_url"]
 
-            url_external_request = urllib.request.Request(
-                url_external_url, data=url_external_data,
-                headers={"Authorization": f"Bearer {SLACK_BOT_TOKEN}"}, method="POST"
-            )
+    # 2. PUT file content to the upload URL
+    print(f"Send to Slack: Uploading {filetype} to URL {upload_url} from {filepath}. File content length: {file_size}")
 
-            with urllib.request.urlopen(url_external_request) as url_external_response:
-                url_external_data = json.loads(url_external_response.read().decode("utf-8"))
+    # Stream the file as the request body instead of reading it into memory.
+    # An explicit Content-Length keeps http.client from switching to chunked encoding.
+    if content is not None:
+        upload_status, _ = http_post(upload_url, content, headers={"Content-Length": str(file_size)})
+    else:
+        with open(filepath, "rb") as f:
+            upload_status, _ = http_post(upload_url, f, headers={"Content-Length": str(file_size)})
 
-            if not url_external_data.get("ok"):
-                raise Exception(f"Error getting upload URL for {filetype}: {url_external_data}")
+    if upload_status != 200:  # Check HTTP status code
+        raise Exception(f"{filetype.capitalize()} upload failed with status code: {upload_status}")
 
-            upload_urls[filetype] = url_external_data["upload_url"]
-            file_ids[filetype] = url_external_data["file_id"]
+    return url_external_data["file_id"]
 
-        # 2. PUT file content to upload URLs
-        for filetype in files:
-            filepath = files[filetype]
-            if not os.path.exists(filepath):
-                continue
+# Send to Slack the Result files (Audio and Transcript)
+def send_files_to_slack(uuid, file_group, initial_comment, input_params, audio_filepath, transcript_filepath, SLACK_BOT_TOKEN, SLACK_CHANNEL_ID):
+    """Uploads audio and transcript to Slack in a single message."""
+    try:
+        files = {}
 
-            with open(filepath, "rb") as f:
-                file_content = f.read()
+        # input_params is uploaded straight from memory; only its file name is needed
+        files["input"] = f"input_params_{file_group}.json"
+        contents = {"input": input_params.encode("utf-8")}
 
-            print(f"Send to Slack: Uploading {filetype} to URL {upload_urls[filetype]} from {filepath}. File content length: {len(file_content)}")
-            upload_request = urllib.request.Request(
-                upload_urls[filetype], data=file_content, method="POST"
-            )
+        if audio_filepath is not None:
+            files["audio"] = audio_filepath
 
-            with urllib.request.urlopen(upload_request) as upload_response:
-                if upload_response.getcode() != 200:  # Check HTTP status code
-                    raise Exception(f"{filetype.capitalize()} upload failed with status code: {upload_response.getcode()}")
+        if transcript_filepath is not None:
+            files["transcript"] = transcript_filepath
 
+        # 1-2. Get an upload URL and upload each file. The files are independent,
+        # so they go through SLACK_UPLOAD_POOL concurrently.
+        file_ids = dict(zip(files, SLACK_UPLOAD_POOL.map(
+            upload_file_to_slack, files, files.values(), [SLACK_BOT_TOKEN] * len(files),
+            [contents.get(filetype) for filetype in files]
+        )))
 
         # 3. files.completeUploadExternal (Combine in one request)
         complete_url = "https://slack.com/api/files.completeUploadExternal"
@@ -658,25 +1067,22 @@ def send_files_to_slack(uuid, file_group, initial_comment, input_params, audio_f
 
 
         for filetype in files:
-            if filetype in file_ids and filetype in files:
-                filepath = files[filetype]
-                file_id = file_ids[filetype]
-                if file_id is not None:
-                    files_data.append({"id": file_id, "title": os.path.basename(filepath)})
-
-        complete_data = urllib.parse.urlencode({
-            "files": json.dumps(files_data),  # Important: JSON string here
+            file_id = file_ids[filetype]
+            if file_id is not None:
+                files_data.append({"id": file_id, "title": os.path.basename(files[filetype])})
+
+        # JSON body, so "files" is sent as a real list instead of a JSON string inside a form field
+        complete_data = orjson.dumps({
+            "files": files_data,
             "channel_id": SLACK_CHANNEL_ID,
             "initial_comment": initial_comment,
-        }).encode("utf-8")
-
-        complete_request = urllib.request.Request(
-            complete_url, data=complete_data,
-            headers={"Authorization": f"Bearer {SLACK_BOT_TOKEN}"}, method="POST"
-        )
+        })
 
-        with urllib.request.urlopen(complete_request) as complete_response:
-            complete_data = json.loads(complete_response.read().decode("utf-8"))
+        _, complete_response = http_post(complete_url, complete_data, headers={
+            "Authorization": f"Bearer {SLACK_BOT_TOKEN}",
+            "Content-Type": "application/json; charset=utf-8"
+        })
+        complete_data = orjson.loads(complete_response)
 
         if complete_data.get("ok"):
             print("Files uploaded successfully.")
@@ -688,10 +1094,10 @@ def send_files_to_slack(uuid, file_group, initial_comment, input_params, audio_f
         print(f"HTTP Error: {e.code} {e.reason}")
         send_text_to_slack(f"[{uuid}][ERROR] HTTP Error: {e.code} {e.reason}", SLACK_BOT_TOKEN, SLACK_CHANNEL_ID)
         try:
-            error_data = json.loads(e.read().decode('utf-8')) # Try to parse error response
+            error_data = orjson.loads(e.read()) # Try to parse error response
             print(f"Error details: {error_data}")
             send_text_to_slack(f"[{uuid}][ERROR] Details: {error_data}", SLACK_BOT_TOKEN, SLACK_CHANNEL_ID)
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             send_text_to_slack(f"[{uuid}][ERROR] Details could not be parsed.", SLACK_BOT_TOKEN, SLACK_CHANNEL_ID)
             print("Error details could not be parsed.")
         return None
@@ -703,6 +1109,16 @@ def send_files_to_slack(uuid, file_group, initial_comment, input_params, audio_f
         send_text_to_slack(f"[{uuid}][ERROR][ERROR] Exception occurred: {e}\n{stack_trace}", SLACK_BOT_TOKEN, SLACK_CHANNEL_ID)
         return None
 
+# Section header templates shared by the Blocks below
+SECTION_H2 = "<h2 style='color: #2196F3; margin-bottom: 10px; padding: 10px 0;'>{title}</h2>"
+SECTION_H3 = "<h3 style='color: #1976D2; margin: 15px 0 10px 0;'>{title}</h3>"
+SECTION_HEADER_CLASSES = ["section-header"]
+FILE_INFO_CLASSES = ["file-info"]
+
+# Radio choices; MOCK_CHOICES are normalized through IS_MOCK_MAP
+TTS_CHOICES = ("openai", "elevenlabs", "edge")
+MOCK_CHOICES = ("yes", "no", "transcript", "transcript2voice", "PromptOnly")
+
 # Create Gradio interface with updated theme
 with gr.Blocks(
     title="Podcastfy.ai",
@@ -736,43 +1152,29 @@ with gr.Blocks(
 
     with gr.Tab("Content"):
         # API Keys Section
-        gr.Markdown(
-            """
-            <h2 style='color: #2196F3; margin-bottom: 10px; padding: 10px 0;'>
-                🔑 API Keys
-            </h2>
-            """,
-            elem_classes=["section-header"]
-        )
+        gr.HTML(SECTION_H2.format(title="🔑 API Keys"), elem_classes=SECTION_HEADER_CLASSES)
         with gr.Accordion("Configure API Keys", open=False):
             gemini_key = gr.Textbox(
                 label="Gemini API Key",
                 type="password",
-                value=os.getenv("GEMINI_API_KEY", ""),
+                value=ENV_CACHE["GEMINI_API_KEY"],
                 info="Required"
             )
             openai_key = gr.Textbox(
                 label="OpenAI API Key",
                 type="password",
-                value=os.getenv("OPENAI_API_KEY", ""),
+                value=ENV_CACHE["OPENAI_API_KEY"],
                 info="Required only if using OpenAI TTS model"
             )
             elevenlabs_key = gr.Textbox(
                 label="ElevenLabs API Key",
                 type="password",
-                value=os.getenv("ELEVENLABS_API_KEY", ""),
+                value=ENV_CACHE["ELEVENLABS_API_KEY"],
                 info="Required only if using ElevenLabs TTS model [recommended]"
             )
 
         # Content Input Section
-        gr.Markdown(
-            """
-            <h2 style='color: #2196F3; margin-bottom: 10px; padding: 10px 0;'>
-                📝 Input Content
-            </h2>
-            """,
-            elem_classes=["section-header"]
-        )
+        gr.HTML(SECTION_H2.format(title="📝 Input Content"), elem_classes=SECTION_HEADER_CLASSES)
         request_id = gr.Textbox(
             label="Request ID",
             value="",
@@ -804,36 +1206,23 @@ with gr.Blocks(
                         pdf_files = gr.Files(  # Changed from gr.File to gr.Files
                             label="Upload PDFs",  # Updated label
                             file_types=[".pdf"],
-                            type="binary"
+                            type="filepath"
                         )
-                        gr.Markdown("*Upload one or more PDF files to generate podcast from*", elem_classes=["file-info"])
+                        gr.Markdown("*Upload one or more PDF files to generate podcast from*", elem_classes=FILE_INFO_CLASSES)
 
                     with gr.Column():
                         image_files = gr.Files(
                             label="Upload Images",
-                            file_types=["image"],
-                            type="binary"
+                            file_types=IMG_FILE_TYPES,
+                            type="filepath"
                         )
-                        gr.Markdown("*Upload one or more images to generate podcast from*", elem_classes=["file-info"])
+                        gr.Markdown("*Upload one or more images to generate podcast from*", elem_classes=FILE_INFO_CLASSES)
 
         # Customization Section
-        gr.Markdown(
-            """
-            <h2 style='color: #2196F3; margin-bottom: 10px; padding: 10px 0;'>
-                ⚙️ Customization Options
-            </h2>
-            """,
-            elem_classes=["section-header"]
-        )
+        gr.HTML(SECTION_H2.format(title="⚙️ Customization Options"), elem_classes=SECTION_HEADER_CLASSES)
         with gr.Accordion("Configure Podcast Settings", open=False):
             # Basic Settings
-            gr.Markdown(
-                """
-                <h3 style='color: #1976D2; margin: 15px 0 10px 0;'>
-                    📊 Basic Settings
-                </h3>
-                """,
-            )
+            gr.HTML(SECTION_H3.format(title="📊 Basic Settings"))
             word_count = gr.Slider(
                 minimum=500,
                 maximum=100000,
@@ -850,13 +1239,7 @@ with gr.Blocks(
             )
 
             # Roles and Structure
-            gr.Markdown(
-                """
-                <h3 style='color: #1976D2; margin: 15px 0 10px 0;'>
-                    👥 Roles and Structure
-                </h3>
-                """,
-            )
+            gr.HTML(SECTION_H3.format(title="👥 Roles and Structure"))
             roles_person1 = gr.Textbox(
                 label="Role of First Speaker",
                 value="main summarizer",
@@ -876,13 +1259,7 @@ with gr.Blocks(
             )
 
             # Podcast Identity
-            gr.Markdown(
-                """
-                <h3 style='color: #1976D2; margin: 15px 0 10px 0;'>
-                    🎙️ Podcast Identity
-                </h3>
-                """,
-            )
+            gr.HTML(SECTION_H3.format(title="🎙️ Podcast Identity"))
             podcast_name = gr.Textbox(
                 label="Podcast Name",
                 value="PODCASTFY",
@@ -896,28 +1273,16 @@ with gr.Blocks(
             )
 
             # Voice Settings
-            gr.Markdown(
-                """
-                <h3 style='color: #1976D2; margin: 15px 0 10px 0;'>
-                    🗣️ Voice Settings
-                </h3>
-                """,
-            )
+            gr.HTML(SECTION_H3.format(title="🗣️ Voice Settings"))
             tts_model = gr.Radio(
-                choices=["openai", "elevenlabs", "edge"],
+                choices=TTS_CHOICES,
                 value="elevenlabs",
                 label="Text-to-Speech Model",
                 info="Choose the voice generation model (edge is free but of low quality, others are superior but require API keys)"
             )
 
             # Advanced Settings
-            gr.Markdown(
-                """
-                <h3 style='color: #1976D2; margin: 15px 0 10px 0;'>
-                    🔧 Advanced Settings
-                </h3>
-                """,
-            )
+            gr.HTML(SECTION_H3.format(title="🔧 Advanced Settings"))
             creativity_level = gr.Slider(
                 minimum=0,
                 maximum=1,
@@ -937,14 +1302,14 @@ with gr.Blocks(
 
             voices = gr.Textbox(
                 label="Custom Voices",
-                value="George, Daniel",
+                value=DEFAULT_VOICES,
                 lines=1,
                 placeholder="",
                 info="Voices that we should use in the conversation. The first will be the 'Question' voice and the other will be the 'Answer' voice."
             )
 
             is_mock = gr.Radio(
-                choices=["yes", "no", "transcript", "transcript2voice", "PromptOnly"],
+                choices=MOCK_CHOICES,
                 value="yes",
                 label="Mock?",
                 info="Enable to actually process this request, disable to simulate the process."
@@ -957,20 +1322,13 @@ with gr.Blocks(
             )
 
     # Output Section
-    gr.Markdown(
-        """
-        <h2 style='color: #2196F3; margin-bottom: 10px; padding: 10px 0;'>
-            🎵 Generated Output
-        </h2>
-        """,
-        elem_classes=["section-header"]
-    )
+    gr.HTML(SECTION_H2.format(title="🎵 Generated Output"), elem_classes=SECTION_HEADER_CLASSES)
     with gr.Group():
         generate_btn = gr.Button("🎙️ Generate Podcast", variant="primary")
         audio_output = gr.Audio(
             type="filepath",
             label="Generated Podcast"
-        ),
+        )
         transcript_output = gr.File(
             type="filepath",
             label="Generated Transcript"
@@ -1010,4 +1368,5 @@ with gr.Blocks(
     )
 
 if __name__ == "__main__":
-    demo.queue().launch(share=True)
+    schedule_cache_sweep()
+    demo.queue(max_size=PODCAST_QUEUE_SIZE, default_concurrency_limit=HANDLER_CONCURRENCY).launch(share=PODCASTFY_SHARE)